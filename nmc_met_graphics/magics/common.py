@@ -8,21 +8,16 @@ Some common magics plot elements.
 """
 
 import datetime
+import functools
 import numpy as np
 from Magics import macro as magics
 
 
-def _get_title(head=None, name='', time=None, fhour=None, tzone='UTC'):
+@functools.lru_cache(maxsize=256)
+def _title_lines(head, name, time_str, fhour_str, valid_str, tzone):
     """
-    Construct the title string for magics.
-
-    Args:
-        head (str, optional): head information string. Defaults to None.
-        name (str, optional): product or model name. Defaults to ''. 
-        time (datetime, optional): datetime object, analysis or initial time, like 
-            time = dt.datetime.strptime('2016071912','%Y%m%d%H'). Defaults to None.
-        fhour (int, optional): forecast hour. Defaults to None.
-        tzone (str, optional): time zone. Defaults to None.
+    Build the title text lines from pre-formatted strings, so repeated
+    titles (like re-rendered frames) come from the cache.
     """
 
     text_lines = []
@@ -36,33 +31,62 @@ def _get_title(head=None, name='', time=None, fhour=None, tzone='UTC'):
             """.format(name, head))
     
     # the model time stamp
-    if time is not None:
-        # convert numpy.datetime64 to datetime
-        if isinstance(time, np.datetime64):
-            time = time.astype('M8[ms]').astype('O')
-            
-        if fhour is not None:
-            validtime = time + datetime.timedelta(hours = fhour)
+    if time_str is not None:
+        if fhour_str is not None:
             text_lines.append(
                 """
                 <font size='0.8' colour='black'>Init: {}({}) -- </font>
                 <font size='0.8' colour='red'><b>[{}]</b></font>
                 <font size='0.8' colour='black'> --> Valid: </font>
                 <font size='0.8' colour='blue'><b>{}({})</b></font>
-                """.format(
-                    time.strftime("%Y/%m/%d %H:%M"), tzone, str(int(fhour)).zfill(3),
-                    validtime.strftime("%Y/%m/%d %H:%M"), tzone))
+                """.format(time_str, tzone, fhour_str, valid_str, tzone))
         else:
             text_lines.append("<font size='0.8' colour='red'>{}({})</font>".format(
-                time.strftime("%Y/%m/%d %H:%M"), tzone))
+                time_str, tzone))
     else:
         text_lines.append(" ")
-    
-    title = magics.mtext(
-        text_lines = text_lines,
-        text_justification = 'left')
 
-    return title
+    return tuple(text_lines)
+
+
+def _get_title(head=None, name='', time=None, fhour=None, tzone='UTC'):
+    """
+    Construct the title string for magics.
+
+    Args:
+        head (str, optional): head information string. Defaults to None.
+        name (str, optional): product or model name. Defaults to ''. 
+        time (datetime, optional): datetime object, analysis or initial time, like 
+            time = dt.datetime.strptime('2016071912','%Y%m%d%H'). Defaults to None.
+        fhour (int, optional): forecast hour. Defaults to None.
+        tzone (str, optional): time zone. Defaults to None.
+    """
+
+    time_str = fhour_str = valid_str = None
+    if time is not None:
+        # convert numpy.datetime64 to datetime
+        if isinstance(time, np.datetime64):
+            time = time.astype('M8[ms]').astype('O')
+        time_str = time.strftime("%Y/%m/%d %H:%M")
+        if fhour is not None:
+            validtime = time + datetime.timedelta(hours = fhour)
+            fhour_str = str(int(fhour)).zfill(3)
+            valid_str = validtime.strftime("%Y/%m/%d %H:%M")
+
+    text_lines = _title_lines(head, name, time_str, fhour_str, valid_str, tzone)
+
+    return _title_text(text_lines)
+
+
+@functools.lru_cache(maxsize=256)
+def _title_text(text_lines):
+    """
+    Cached magics text definition of the title lines. Magics mtext has no
+    per-line font size or colour parameters, so the styles stay as html tags.
+    """
+    return magics.mtext(
+        text_lines = list(text_lines),
+        text_justification = 'left')
 
 
 def _get_legend(china_map, title='', frequency=1):
@@ -7,6 +7,10 @@
 Plot atmospheric dynamics maps.
 """
 
+import functools
+import itertools
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import xarray as xr
 import scipy.ndimage as ndimage
@@ -17,32 +21,373 @@ from nmc_met_graphics.util import check_kwargs
 from Magics import macro as magics
 
 
-def draw_wind_upper(uwind, vwind, lon, lat, gh=None, skip_vector=None, 
-                    map_region=None, title_kwargs={}, outfile=None):
+# Magics styles for the dynamics maps, sequences are kept as tuples and
+# converted to lists (what Magics expects) when the definition is built.
+_MSLP_LEVELS = tuple(940.+i*2.5 for i in range(51))
+_MSLP_COLORS = (
+    '#FD90EB', '#EB78E5', '#EF53E0', '#F11FD3', '#F11FD3', '#A20E9B', '#880576', '#6D0258', '#5F0853', 
+    '#2A0DA8', '#2F1AA7', '#3D27B4', '#3F3CB6', '#6D5CDE', '#A28CF9', '#C1B3FF', '#DDDCFE', '#1861DB',
+    '#206CE5', '#2484F4', '#52A5EE', '#91D4FF', '#B2EFF8', '#DEFEFF', '#C9FDBD', '#91F78B', '#53ED54',
+    '#1DB31E', '#0CA104', '#FFF9A4', '#FFE27F', '#FAC235', '#FF9D04', '#FF5E00', '#F83302', '#E01304',
+    '#A20200', '#603329', '#8C6653', '#B18981', '#DDC0B3', '#F8A3A2', '#DD6663', '#CA3C3B', '#A1241D', 
+    '#6C6F6D', '#8A8A8A', '#AAAAAA', '#C5C5C5', '#D5D5D5', '#E7E3E4')
+
+_MCONT_KW = {
+    'wspeed_upper': dict(
+        legend= 'on',
+        contour_level_selection_type= 'level_list', 
+        contour_level_list= (30., 40., 50., 60., 70., 80., 90., 100.), 
+        contour_shade= 'on', 
+        contour_shade_max_level_colour= 'evergreen', 
+        contour_shade_min_level_colour= 'yellow',
+        contour_shade_method= 'area_fill', 
+        contour_reference_level= 0., 
+        contour_highlight= 'off', 
+        contour_hilo= 'hi', 
+        contour_hilo_format= '(F3.0)', 
+        contour_hilo_height= 0.6, 
+        contour_hilo_type= 'number', 
+        contour_hilo_window_size=10,
+        contour_label= 'off'),
+    'wspeed_high': dict(
+        legend= 'on',
+        contour_level_selection_type= 'interval', 
+        contour_shade_max_level= 44.,
+        contour_shade_min_level= 8., 
+        contour_interval= 4.,
+        contour_shade= 'on', 
+        contour= "off",
+        contour_shade_method= 'area_fill', 
+        contour_shade_colour_method = 'palette',
+        contour_shade_palette_name = 'eccharts_rainbow_blue_purple_9',
+        contour_reference_level= 8., 
+        contour_highlight= 'off', 
+        contour_hilo= 'hi', 
+        contour_hilo_format= '(F3.0)', 
+        contour_hilo_height= 0.6, 
+        contour_hilo_type= 'number', 
+        contour_hilo_window_size=10,
+        contour_label= 'off'),
+    'vort': dict(
+        legend= 'on',
+        contour_level_selection_type= 'level_list', 
+        contour_level_list= (-200.0, -100.0, -75.0, -50.0, -30.0, -20.0, -15.0, -13.0, -11.0, -9.0, -7.0, 
+                             -5.0, -3.0, -1.0, 1.0, 3.0, 5.0, 7.0, 9.0, 11.0, 13.0, 15.0, 20.0, 30.0, 50.0,
+                             75.0, 100.0, 200.0),
+        contour_shade= 'on', 
+        contour= "off",
+        contour_shade_method= 'area_fill', 
+        contour_shade_colour_method = 'list',
+        contour_shade_colour_list = (
+            "rgb(0,0,0.3)","rgb(0,0,0.5)","rgb(0,0,0.7)","rgb(0,0,0.9)","rgb(0,0.15,1)","rgb(0,0.3,1)",
+            "rgb(0,0.45,1)","rgb(0,0.6,1)","rgb(0,0.75,1)","rgb(0,0.85,1)","rgb(0.2,0.95,1)","rgb(0.45,1,1)",
+            "rgb(0.75,1,1)","none","rgb(1,1,0)","rgb(1,0.9,0)","rgb(1,0.8,0)","rgb(1,0.7,0)","rgb(1,0.6,0)",
+            "rgb(1,0.5,0)","rgb(1,0.4,0)","rgb(1,0.3,0)","rgb(1,0.15,0)","rgb(0.9,0,0)","rgb(0.7,0,0)",
+            "rgb(0.5,0,0)","rgb(0.3,0,0)"),
+        contour_reference_level= 8., 
+        contour_highlight= 'off', 
+        contour_hilo= 'off', 
+        contour_label= 'off'),
+    'mslp': dict(
+        legend= 'on',
+        contour_shade= "on",
+        contour_hilo= "on",
+        contour_hilo_height= 0.6,
+        contour_hi_colour= 'blue',
+        contour_lo_colour= 'red',
+        contour_hilo_window_size= 5,
+        contour= "off",
+        contour_label= "off",
+        contour_shade_method= "area_fill",
+        contour_level_selection_type= "level_list",
+        contour_level_list= _MSLP_LEVELS,
+        contour_shade_colour_method= "list",
+        contour_shade_colour_list= _MSLP_COLORS)}
+
+_MWIND_KW = {
+    'arrows_upper': dict(
+        legend= 'on',
+        wind_field_type= 'arrows',
+        wind_arrow_head_shape=1,
+        wind_arrow_thickness= 0.5,
+        wind_arrow_unit_velocity=50,
+        wind_arrow_colour= 'evergreen')}
+
+
+def _to_magics_kwargs(kwargs):
     """
-    Draw 200hPa wind speed and vector field.
+    Convert the tuple values of a style dictionary to lists for Magics.
+    """
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in kwargs.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _mcont_cached(name, **kwargs):
+    """
+    Cached contour definition of the _MCONT_KW style, kwargs override the style.
+    """
+    return magics.mcont(**_to_magics_kwargs({**_MCONT_KW[name], **kwargs}))
+
+
+@functools.lru_cache(maxsize=None)
+def _mwind_cached(name):
+    """
+    Cached wind definition of the _MWIND_KW style.
+    """
+    return magics.mwind(**_to_magics_kwargs(_MWIND_KW[name]))
+
+
+@functools.lru_cache(maxsize=32)
+def _gh_contour_cached(interval=20, reference=5880, color='black'):
+    """
+    Cached geopotential height contours.
+    """
+    return common._get_gh_contour(interval=interval, reference=reference, color=color)
+
+
+@functools.lru_cache(maxsize=None)
+def _wind_flags_cached():
+    """
+    Cached wind flags.
+    """
+    return common._get_wind_flags()
+
+
+def _region_slice(coord, cmin, cmax, pad=1):
+    """
+    Compute the index slice of a monotonic coordinate covering [cmin, cmax],
+    padded with pad grid points on each side so contours reach the frame.
+    """
+    n = len(coord)
+    if coord[0] <= coord[-1]:
+        i0 = np.searchsorted(coord, cmin, side='left')
+        i1 = np.searchsorted(coord, cmax, side='right')
+    else:
+        rcoord = coord[::-1]
+        i0 = n - np.searchsorted(rcoord, cmax, side='right')
+        i1 = n - np.searchsorted(rcoord, cmin, side='left')
+    i0, i1 = max(i0 - pad, 0), min(i1 + pad, n)
+    if i1 - i0 < 2:
+        return slice(0, n)
+    return slice(i0, i1)
+
+
+def _lon_slice(lon, lonmin, lonmax, pad=1):
+    """
+    Compute the longitude index slice of [lonmin, lonmax]. The region is shifted
+    by 360 degrees to match the grid convention (0~360 or -180~180). When it
+    still wraps around or extends beyond the grid, the whole grid is kept.
+    """
+    lo, hi = np.min(lon), np.max(lon)
+    for shift in (0., -360., 360.):
+        if lo <= lonmin + shift and lonmax + shift <= hi:
+            return _region_slice(lon, lonmin + shift, lonmax + shift, pad=pad)
+    return slice(0, len(lon))
+
+
+def _crop_to_region(lon, lat, map_region, *arrays, pad=1):
+    """
+    Crop lon, lat and 2D arrays, [nlat, nlon], to the map_region bounding box.
+    Returns views, None arrays are passed through.
+
+    Args:
+        lon (np.array): longitude, 1D array, [nlon]
+        lat (np.array): latitude, 1D array, [nlat]
+        map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
+        arrays (np.array): 2D arrays, [nlat, nlon]
+        pad (int, optional): extra grid points kept outside the region. Defaults to 1.
+    """
+    islice = _lon_slice(lon, map_region[0], map_region[1], pad=pad)
+    jslice = _region_slice(lat, map_region[2], map_region[3], pad=pad)
+    arrays = tuple(None if a is None else a[jslice, islice] for a in arrays)
+    return (lon[islice], lat[jslice]) + arrays
+
+
+def _squeeze(a):
+    """
+    Remove singleton axes, like [1, nlat, nlon] fields, None is passed through.
+    """
+    return None if a is None else np.squeeze(a)
+
+
+def _prep(a):
+    """
+    Convert a field to a C-contiguous float64 array, the dtype Magics takes,
+    so minput_2d_raw can pass it on without another copy. None is passed through.
+    """
+    return None if a is None else np.ascontiguousarray(a, dtype=np.float64)
+
+
+def _minput_2d(data, lon, lat, metadata):
+    """
+    Put the data into magics minput, regular grids skip the coordinate lists.
+    """
+    if util.is_regular_grid(lon, lat):
+        return util.minput_2d_raw(data, lon, lat, metadata)
+    return util.minput_2d(data, lon, lat, metadata)
+
+
+@dataclass
+class _Fields:
+    """
+    Magics fields of a wind map, each one is built once when first read.
+    The shading fields (wind speed or vorticity) are only read when the
+    shading is drawn. Pre-built fields can be assigned to the attributes
+    to skip building.
+    """
+    uwind: np.ndarray
+    vwind: np.ndarray
+    lon: np.ndarray
+    lat: np.ndarray
+    gh: np.ndarray = None
+    vort: np.ndarray = None
+    skip: int = 1
+    smooth_factor: float = 1.0
+
+    @functools.cached_property
+    def wspeed(self):
+        return np.hypot(self.uwind, self.vwind)
+
+    @functools.cached_property
+    def wspeed_field(self):
+        return _minput_2d(self.wspeed, self.lon, self.lat, {'long_name': 'Wind Speed', 'units': 'm/s'})
+
+    @functools.cached_property
+    def vorticity(self):
+        if self.vort is not None:
+            return self.vort
+        dx, dy = calc.lat_lon_grid_deltas(self.lon, self.lat)
+        vort = calc.vorticity(
+            self.uwind * units.meter/units.second, self.vwind * units.meter/units.second, dx, dy)
+        return ndimage.gaussian_filter(vort, sigma=self.smooth_factor, order=0)* 10**5
+
+    @functools.cached_property
+    def vort_field(self):
+        return _minput_2d(self.vorticity, self.lon, self.lat, {'long_name': 'vorticity', 'units': 's-1'})
+
+    @functools.cached_property
+    def wind(self):
+        skip = self.skip
+        return util.minput_2d_vector(
+            self.uwind[::skip, ::skip], self.vwind[::skip, ::skip],
+            self.lon[::skip], self.lat[::skip])
+
+    @functools.cached_property
+    def gh_field(self):
+        if self.gh is None:
+            return None
+        return _minput_2d(self.gh, self.lon, self.lat, {'long_name': 'height', 'units': 'gpm'})
+
+
+@functools.lru_cache(maxsize=32)
+def _mmap_cached(name, region_tuple=None, thick=5):
+    """
+    Cached map background, region_tuple is the hashable map_region.
+    """
+    if region_tuple is None:
+        return map_set.get_mmap(name=name, subpage_frame_thickness=thick)
+    return map_set.get_mmap(
+        name=name, map_region=list(region_tuple), subpage_frame_thickness=thick)
+
+
+@functools.lru_cache(maxsize=32)
+def _mcoast_cached(name):
+    """
+    Cached map coastlines.
+    """
+    return map_set.get_mcoast(name=name)
+
+
+@functools.lru_cache(maxsize=32)
+def _legend_cached(china_map, title='', frequency=1):
+    """
+    Cached legend, china_map should come from _get_china_map so it is
+    the same object for the same map region.
+    """
+    return common._get_legend(china_map, title=title, frequency=frequency)
+
+
+def _get_china_map(map_region):
+    """
+    Get the (cached) china map background for the map_region.
+    """
+    if map_region is None:
+        return _mmap_cached('CHINA_CYLINDRICAL', None, 5)
+    return _mmap_cached('CHINA_REGION_CYLINDRICAL', tuple(map_region), 5)
+
+
+# Visual presets of the wind maps drawn by _draw_wind_core.
+_PRESETS = {
+    'upper': dict(
+        shade='wspeed', shade_contour='wspeed_upper', shade_min=30.,
+        wind_vector='arrows_upper', gh_contour=dict(interval=50, reference=12520, color='black'),
+        legend_title="Wind Speed [m/s]", head="200hPa Wind | GH"),
+    'high': dict(
+        shade='wspeed', shade_contour='wspeed_high', shade_min=None,
+        wind_vector='flags', gh_contour={},
+        legend_title="Wind Speed [m/s]", head="850hPa Wind | 500hPa GH"),
+    'vort': dict(
+        shade='vort', shade_contour='vort', shade_min=None,
+        wind_vector='flags', gh_contour={},
+        legend_title="Vorticity [s^-1]", head="500hPa Relative vorticity | Wind | GH")}
+
+
+def _draw_wind_core(uwind, vwind, lon, lat, preset, gh=None, vort=None, skip_vector=None,
+                    smooth_factor=1.0, map_region=None, title_kwargs={}, outfile=None, fast=False,
+                    gh_field=None, wspeed_field=None):
+    """
+    Draw wind vectors over wind speed or vorticity shading, with the _PRESETS style.
 
     Args:
         uwind (np.array): u wind component, 2D array, [nlat, nlon]
         vwind (np.array): v wind component, 2D array, [nlat, nlon]
         lon (np.array): longitude, 1D array, [nlon]
         lat (np.array): latitude, 1D array, [nlat]
+        preset (str): preset name of _PRESETS, 'upper', 'high' or 'vort'.
         gh (np.array): geopotential height, 2D array, [nlat, nlon]
+        vort (np.array, optional): vorticity component, 2D array, [nlat, nlon], only for 'vort' preset.
         skip_vector (integer): skip grid number for vector plot
+        smooth_factor (float): smooth factor for vorticity, larger for smoother.
         map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
         title_kwargs (dictionaly, optional): keyword arguments for _get_title function.
+        outfile (str, optional): output png file name.
+        fast (bool, optional): draft output, see util.magics_plot.
+        gh_field (optional): pre-built magics gh field, used instead of gh.
+        wspeed_field (optional): pre-built magics wind speed field, for 'upper' and 'high' presets.
+            Pre-built fields are used as given, map_region cropping does not apply to them.
     """
 
-    # check default parameters
+    style = _PRESETS[preset]
+
+    # drop singleton axes before cropping and striding [nlat, nlon] fields
+    lon, lat, uwind, vwind, gh, vort = map(_squeeze, (lon, lat, uwind, vwind, gh, vort))
+
+    # crop data to the map region
+    if map_region is not None:
+        # keep a wider margin so the vorticity smoothing is unaffected at the frame
+        if style['shade'] == 'vort' and vort is None:
+            pad = int(np.ceil(4*smooth_factor)) + 1
+        else:
+            pad = 1
+        lon, lat, uwind, vwind, vort, gh = _crop_to_region(
+            lon, lat, map_region, uwind, vwind, vort, gh, pad=pad)
+
+    # copy the cropped views once into contiguous float64 arrays
+    uwind, vwind, gh, vort = map(_prep, (uwind, vwind, gh, vort))
+
+    # check default parameters, lon/lat are already cropped (maybe shifted by
+    # 360 degrees from map_region), so do not filter them by map_region again
     if skip_vector is None:
-        skip_vector = util.get_skip_vector(lon, lat, map_region)
+        skip_vector = util.get_skip_vector(lon, lat, None)
 
     # put data into fields
-    wind_field = util.minput_2d_vector(uwind, vwind, lon, lat, skip=skip_vector)
-    wspeed = np.sqrt(uwind*uwind + vwind*vwind)
-    wspeed_field = util.minput_2d(wspeed, lon, lat, {'long_name': 'Wind Speed', 'units': 'm/s'})
-    if gh is not None:
-        gh_field = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
+    fields = _Fields(
+        uwind, vwind, lon, lat, gh=gh, vort=vort, skip=skip_vector, smooth_factor=smooth_factor)
+    if gh_field is not None:
+        fields.gh_field = gh_field
+    if wspeed_field is not None:
+        fields.wspeed_field = wspeed_field
+        fields.wspeed = wspeed_field.args['input_field']
 
     #
     # set up visual parameters
@@ -51,71 +396,84 @@ def draw_wind_upper(uwind, vwind, lon, lat, gh=None, skip_vector=None,
     plots = []
 
     # Setting the coordinates of the geographical area
-    if map_region is None:
-        china_map = map_set.get_mmap(
-            name='CHINA_CYLINDRICAL',
-            subpage_frame_thickness = 5)
-    else:
-        china_map = map_set.get_mmap(
-            name='CHINA_REGION_CYLINDRICAL',
-            map_region=map_region,
-            subpage_frame_thickness = 5)
+    china_map = _get_china_map(map_region)
     plots.append(china_map)
 
     # Background Coaslines
-    coastlines = map_set.get_mcoast(name='COAST_FILL')
+    coastlines = _mcoast_cached('COAST_FILL')
     plots.append(coastlines)
 
-    # Define the shading for the wind speed
-    if wspeed.max() > 30.:
-        wspeed_contour = magics.mcont(
-            legend= 'on',
-            contour_level_selection_type= 'level_list', 
-            contour_level_list= [30., 40., 50., 60., 70., 80., 90., 100.], 
-            contour_shade= 'on', 
-            contour_shade_max_level_colour= 'evergreen', 
-            contour_shade_min_level_colour= 'yellow',
-            contour_shade_method= 'area_fill', 
-            contour_reference_level= 0., 
-            contour_highlight= 'off', 
-            contour_hilo= 'hi', 
-            contour_hilo_format= '(F3.0)', 
-            contour_hilo_height= 0.6, 
-            contour_hilo_type= 'number', 
-            contour_hilo_window_size=10,
-            contour_label= 'off')
-        plots.extend([wspeed_field, wspeed_contour])
+    # Define the shading contour
+    # (shade_min is only set for the wind speed presets, NaN grid points are ignored)
+    if style['shade_min'] is None or np.nanmax(fields.wspeed) > style['shade_min']:
+        if style['shade'] == 'wspeed':
+            shade_field = fields.wspeed_field
+        else:
+            shade_field = fields.vort_field
+        shade_contour = _mcont_cached(style['shade_contour'])
+        plots.extend([shade_field, shade_contour])
 
     # Define the wind vector
-    wind_vector = magics.mwind(
-        legend= 'on',
-        wind_field_type= 'arrows',
-        wind_arrow_head_shape=1,
-        wind_arrow_thickness= 0.5,
-        wind_arrow_unit_velocity=50,
-        wind_arrow_colour= 'evergreen')
-    plots.extend([wind_field, wind_vector])
+    if style['wind_vector'] == 'flags':
+        wind_vector = _wind_flags_cached()
+    else:
+        wind_vector = _mwind_cached(style['wind_vector'])
+    plots.extend([fields.wind, wind_vector])
 
     # Define the simple contouring for gh
-    if gh is not None:
-        gh_contour = common._get_gh_contour(interval=50, reference=12520, color='black')
-        plots.extend([gh_field, gh_contour])
+    if fields.gh_field is not None:
+        gh_contour = _gh_contour_cached(**style['gh_contour'])
+        plots.extend([fields.gh_field, gh_contour])
 
     # Add a legend
-    legend = common._get_legend(china_map, title="Wind Speed [m/s]")
+    legend = _legend_cached(china_map, title=style['legend_title'])
     plots.append(legend)
 
     # Add the title
-    title_kwargs = check_kwargs(title_kwargs, 'head', "200hPa Wind | GH")
+    title_kwargs = check_kwargs(title_kwargs, 'head', style['head'])
     title = common._get_title(**title_kwargs)
     plots.append(title)
 
     # Add china province
-    china_coastlines = map_set.get_mcoast(name='PROVINCE')
+    china_coastlines = _mcoast_cached('PROVINCE')
     plots.append(china_coastlines)
 
     # final plot
-    return util.magics_plot(plots, outfile)
+    return util.magics_plot(plots, outfile, fast=fast)
+
+
+def draw_wind_upper(uwind, vwind, lon, lat, gh=None, skip_vector=None, 
+                    map_region=None, title_kwargs={}, outfile=None,
+                    gh_field=None, wspeed_field=None, fast=False):
+    """
+    Draw 200hPa wind speed and vector field.
+
+    Args:
+        uwind (np.array): u wind component, 2D array, [nlat, nlon]
+        vwind (np.array): v wind component, 2D array, [nlat, nlon]
+        lon (np.array): longitude, 1D array, [nlon]
+        lat (np.array): latitude, 1D array, [nlat]
+        gh (np.array): geopotential height, 2D array, [nlat, nlon]
+        skip_vector (integer): skip grid number for vector plot
+        map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
+        title_kwargs (dictionaly, optional): keyword arguments for _get_title function.
+        gh_field (optional): pre-built magics gh field, used instead of gh. Loops drawing
+            several maps for a time step can build it once,
+            gh_field = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'}),
+            and pass it to each draw function.
+        wspeed_field (optional): pre-built magics wind speed field, used instead of
+            computing it from uwind and vwind. Like gh_field, build it once with
+            util.minput_2d(np.hypot(uwind, vwind), lon, lat, {'long_name': 'Wind Speed', 'units': 'm/s'})
+            to draw both draw_wind_upper and draw_wind_high for the same wind.
+            Pre-built fields are not cropped to map_region, so build them on the
+            map_region window; the shading threshold is checked on its values too.
+        fast (bool, optional): draft output without antialiasing, see util.magics_plot.
+    """
+
+    return _draw_wind_core(
+        uwind, vwind, lon, lat, 'upper', gh=gh, skip_vector=skip_vector,
+        map_region=map_region, title_kwargs=title_kwargs, outfile=outfile,
+        gh_field=gh_field, wspeed_field=wspeed_field, fast=fast)
 
 
 def draw_height_temp(gh, temp, lon, lat, map_region=None, 
@@ -219,7 +577,8 @@ def draw_height_temp(gh, temp, lon, lat, map_region=None,
 
 
 def draw_wind_high(uwind, vwind, lon, lat, gh=None, skip_vector=None, 
-                   map_region=None, title_kwargs={}, outfile=None):
+                   map_region=None, title_kwargs={}, outfile=None,
+                   gh_field=None, wspeed_field=None, fast=False):
     """
     Draw high wind speed and flags.
 
@@ -232,90 +591,20 @@ def draw_wind_high(uwind, vwind, lon, lat, gh=None, skip_vector=None,
         skip_vector (integer): skip grid number for vector plot
         map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
         title_kwargs (dictionaly, optional): keyword arguments for _get_title function.
+        gh_field (optional): pre-built magics gh field used instead of gh, see draw_wind_upper.
+        wspeed_field (optional): pre-built magics wind speed field, see draw_wind_upper.
+        fast (bool, optional): draft output without antialiasing, see util.magics_plot.
     """
 
-    # check default parameters
-    if skip_vector is None:
-        skip_vector = util.get_skip_vector(lon, lat, map_region)
-
-    # put data into fields
-    wind_field = util.minput_2d_vector(uwind, vwind, lon, lat, skip=skip_vector)
-    wspeed_field = util.minput_2d(np.sqrt(uwind*uwind + vwind*vwind), lon, lat, {'long_name': 'Wind Speed', 'units': 'm/s'})
-    if gh is not None:
-        gh_field = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
-
-    #
-    # set up visual parameters
-    #
-
-    plots = []
-
-    # Setting the coordinates of the geographical area
-    if map_region is None:
-        china_map = map_set.get_mmap(
-            name='CHINA_CYLINDRICAL',
-            subpage_frame_thickness = 5)
-    else:
-        china_map = map_set.get_mmap(
-            name='CHINA_REGION_CYLINDRICAL',
-            map_region=map_region,
-            subpage_frame_thickness = 5)
-    plots.append(china_map)
-
-    # Background Coaslines
-    coastlines = map_set.get_mcoast(name='COAST_FILL')
-    plots.append(coastlines)
-
-    # Define the shading for the wind speed
-    wspeed_contour = magics.mcont(
-        legend= 'on',
-        contour_level_selection_type= 'interval', 
-        contour_shade_max_level= 44.,
-        contour_shade_min_level= 8., 
-        contour_interval= 4.,
-        contour_shade= 'on', 
-        contour= "off",
-        contour_shade_method= 'area_fill', 
-        contour_shade_colour_method = 'palette',
-        contour_shade_palette_name = 'eccharts_rainbow_blue_purple_9',
-        contour_reference_level= 8., 
-        contour_highlight= 'off', 
-        contour_hilo= 'hi', 
-        contour_hilo_format= '(F3.0)', 
-        contour_hilo_height= 0.6, 
-        contour_hilo_type= 'number', 
-        contour_hilo_window_size=10,
-        contour_label= 'off')
-    plots.extend([wspeed_field, wspeed_contour])
-
-    # Define the wind vector
-    wind_vector = common._get_wind_flags()
-    plots.extend([wind_field, wind_vector])
-
-    # Define the simple contouring for gh
-    if gh is not None:
-        gh_contour = common._get_gh_contour()
-        plots.extend([gh_field, gh_contour])
-
-    # Add a legend
-    legend = common._get_legend(china_map, title="Wind Speed [m/s]")
-    plots.append(legend)
-
-    # Add the title
-    title_kwargs = check_kwargs(title_kwargs, 'head', "850hPa Wind | 500hPa GH")
-    title = common._get_title(**title_kwargs)
-    plots.append(title)
-
-    # Add china province
-    china_coastlines = map_set.get_mcoast(name='PROVINCE')
-    plots.append(china_coastlines)
-
-    # final plot
-    return util.magics_plot(plots, outfile)
+    return _draw_wind_core(
+        uwind, vwind, lon, lat, 'high', gh=gh, skip_vector=skip_vector,
+        map_region=map_region, title_kwargs=title_kwargs, outfile=outfile,
+        gh_field=gh_field, wspeed_field=wspeed_field, fast=fast)
 
 
 def draw_vort_high(uwind, vwind, lon, lat, vort=None, gh=None, skip_vector=None, smooth_factor=1.0,
-                   map_region=None, title_kwargs={}, outfile=None):
+                   map_region=None, title_kwargs={}, outfile=None,
+                   gh_field=None, fast=False):
     """
     Draw high vorticity.
 
@@ -330,90 +619,14 @@ def draw_vort_high(uwind, vwind, lon, lat, vort=None, gh=None, skip_vector=None,
         smooth_factor (float): smooth factor for vorticity, larger for smoother.
         map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
         title_kwargs (dictionaly, optional): keyword arguments for _get_title function.
+        gh_field (optional): pre-built magics gh field used instead of gh, see draw_wind_upper.
+        fast (bool, optional): draft output without antialiasing, see util.magics_plot.
     """
 
-    # check default parameters
-    if skip_vector is None:
-        skip_vector = util.get_skip_vector(lon, lat, map_region)
-
-    # put data into fields
-    wind_field = util.minput_2d_vector(uwind, vwind, lon, lat, skip=skip_vector)
-    if vort is None:
-        dx, dy = calc.lat_lon_grid_deltas(lon, lat)
-        vort = calc.vorticity(uwind * units.meter/units.second, vwind * units.meter/units.second, dx, dy)
-        vort = ndimage.gaussian_filter(vort,sigma=smooth_factor, order=0)* 10**5
-    vort_field = util.minput_2d(vort, lon, lat, {'long_name': 'vorticity', 'units': 's-1'})
-    if gh is not None:
-        gh_feild = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
-
-    #
-    # set up visual parameters
-    #
-    plots = []
-
-    # Setting the coordinates of the geographical area
-    if map_region is None:
-        china_map = map_set.get_mmap(
-            name='CHINA_CYLINDRICAL',
-            subpage_frame_thickness = 5)
-    else:
-        china_map = map_set.get_mmap(
-            name='CHINA_REGION_CYLINDRICAL',
-            map_region=map_region,
-            subpage_frame_thickness = 5)
-    plots.append(china_map)
-
-    # Background Coaslines
-    coastlines = map_set.get_mcoast(name='COAST_FILL')
-    plots.append(coastlines)
-
-    # Define the shading contour
-    vort_contour = magics.mcont(
-        legend= 'on',
-        contour_level_selection_type= 'level_list', 
-        contour_level_list= [-200.0, -100.0, -75.0, -50.0, -30.0, -20.0, -15.0, -13.0, -11.0, -9.0, -7.0, 
-                             -5.0, -3.0, -1.0, 1.0, 3.0, 5.0, 7.0, 9.0, 11.0, 13.0, 15.0, 20.0, 30.0, 50.0,
-                             75.0, 100.0, 200.0],
-        contour_shade= 'on', 
-        contour= "off",
-        contour_shade_method= 'area_fill', 
-        contour_shade_colour_method = 'list',
-        contour_shade_colour_list = [
-            "rgb(0,0,0.3)","rgb(0,0,0.5)","rgb(0,0,0.7)","rgb(0,0,0.9)","rgb(0,0.15,1)","rgb(0,0.3,1)",
-            "rgb(0,0.45,1)","rgb(0,0.6,1)","rgb(0,0.75,1)","rgb(0,0.85,1)","rgb(0.2,0.95,1)","rgb(0.45,1,1)",
-            "rgb(0.75,1,1)","none","rgb(1,1,0)","rgb(1,0.9,0)","rgb(1,0.8,0)","rgb(1,0.7,0)","rgb(1,0.6,0)",
-            "rgb(1,0.5,0)","rgb(1,0.4,0)","rgb(1,0.3,0)","rgb(1,0.15,0)","rgb(0.9,0,0)","rgb(0.7,0,0)",
-            "rgb(0.5,0,0)","rgb(0.3,0,0)"],
-        contour_reference_level= 8., 
-        contour_highlight= 'off', 
-        contour_hilo= 'off', 
-        contour_label= 'off')
-    plots.extend([vort_field, vort_contour])
-
-    # Define the wind vector
-    wind_vector = common._get_wind_flags()
-    plots.extend([wind_field, wind_vector])
-
-    # Define the simple contouring for gh
-    if gh is not None:
-        gh_contour = common._get_gh_contour()
-        plots.extend([gh_feild, gh_contour])
-
-    # Add a legend
-    legend = common._get_legend(china_map, title="Vorticity [s^-1]")
-    plots.append(legend)
-
-    # Add the title
-    title_kwargs = check_kwargs(title_kwargs, 'head', "500hPa Relative vorticity | Wind | GH")
-    title = common._get_title(**title_kwargs)
-    plots.append(title)
-
-    # Add china province
-    china_coastlines = map_set.get_mcoast(name='PROVINCE')
-    plots.append(china_coastlines)
-
-    # final plot
-    return util.magics_plot(plots, outfile)
+    return _draw_wind_core(
+        uwind, vwind, lon, lat, 'vort', gh=gh, vort=vort, skip_vector=skip_vector,
+        smooth_factor=smooth_factor, map_region=map_region, title_kwargs=title_kwargs,
+        outfile=outfile, gh_field=gh_field, fast=fast)
 
 
 def draw_vvel_high(uwind, vwind, wwind, lon, lat, gh=None, skip_vector=None,
@@ -441,7 +654,7 @@ def draw_vvel_high(uwind, vwind, wwind, lon, lat, gh=None, skip_vector=None,
     wind_field = util.minput_2d_vector(uwind, vwind, lon, lat, skip=skip_vector)
     vvel_field = util.minput_2d(wwind, lon, lat, {'long_name': 'vertical velocity', 'units': 'Pa/s'})
     if gh is not None:
-        gh_feild = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
+        gh_field = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
 
     #
     # set up visual parameters
@@ -489,7 +702,7 @@ def draw_vvel_high(uwind, vwind, wwind, lon, lat, gh=None, skip_vector=None,
     # Define the simple contouring for gh
     if gh is not None:
         gh_contour = common._get_gh_contour()
-        plots.extend([gh_feild, gh_contour])
+        plots.extend([gh_field, gh_contour])
 
     # Add a legend
     legend = common._get_legend(china_map, title="Vertical Velocity [Pa/s]")
@@ -509,7 +722,8 @@ def draw_vvel_high(uwind, vwind, wwind, lon, lat, gh=None, skip_vector=None,
 
 
 def draw_mslp(mslp, lon, lat, gh=None, map_region=None, 
-              title_kwargs={}, outfile=None):
+              title_kwargs={}, outfile=None, contour_fast=True, skip_mslp=1, gh_field=None,
+              fast=False):
     """
     Draw mean sea level pressure field.
 
@@ -520,12 +734,33 @@ def draw_mslp(mslp, lon, lat, gh=None, map_region=None,
         gh (np.array): geopotential height, 2D array, [nlat, nlon]
         map_region (list or tuple): the map region limit, [lonmin, lonmax, latmin, latmax]
         title_kwargs (dictionaly, optional): keyword arguments for _get_title function.
+        contour_fast (bool, optional): use Magics linear contouring instead of the
+            automatic (akima interpolation) method. Defaults to True.
+        skip_mslp (int, optional): thin the mslp grid by skip_mslp before contouring,
+            like 2 for dense model grids. Defaults to 1.
+        gh_field (optional): pre-built magics gh field used instead of gh, see draw_wind_upper.
+        fast (bool, optional): draft output without antialiasing, see util.magics_plot.
     """
 
+    if int(skip_mslp) != skip_mslp or skip_mslp < 1:
+        raise ValueError("skip_mslp should be a positive integer.")
+
+    # drop singleton axes before cropping [nlat, nlon] fields
+    lon, lat, mslp, gh = map(_squeeze, (lon, lat, mslp, gh))
+
+    # crop data to the map region
+    if map_region is not None:
+        lon, lat, mslp, gh = _crop_to_region(lon, lat, map_region, mslp, gh)
+
+    # copy the cropped views once into contiguous float64 arrays
+    mslp, gh = _prep(mslp), _prep(gh)
+
     # put data into fields
-    mslp_field = util.minput_2d(mslp, lon, lat, {'long_name': 'Sea level pressure', 'units': 'mb'})
-    if gh is not None:
-        gh_field = util.minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
+    mslp_field = _minput_2d(
+        mslp[::skip_mslp, ::skip_mslp], lon[::skip_mslp], lat[::skip_mslp],
+        {'long_name': 'Sea level pressure', 'units': 'mb'})
+    if gh_field is None and gh is not None:
+        gh_field = _minput_2d(gh, lon, lat, {'long_name': 'height', 'units': 'gpm'})
 
     #
     # set up visual parameters
@@ -534,52 +769,26 @@ def draw_mslp(mslp, lon, lat, gh=None, map_region=None,
     plots = []
 
     # Setting the coordinates of the geographical area
-    if map_region is None:
-        china_map = map_set.get_mmap(
-            name='CHINA_CYLINDRICAL',
-            subpage_frame_thickness = 5)
-    else:
-        china_map = map_set.get_mmap(
-            name='CHINA_REGION_CYLINDRICAL',
-            map_region=map_region,
-            subpage_frame_thickness = 5)
+    china_map = _get_china_map(map_region)
     plots.append(china_map)
 
     # Background Coaslines
-    coastlines = map_set.get_mcoast(name='COAST_FILL')
+    coastlines = _mcoast_cached('COAST_FILL')
     plots.append(coastlines)
 
     # Define the shading for teperature
-    mslp_contour = magics.mcont(
-        legend= 'on',
-        contour_shade= "on",
-        contour_hilo= "on",
-        contour_hilo_height= 0.6,
-        contour_hi_colour= 'blue',
-        contour_lo_colour= 'red',
-        contour_hilo_window_size= 5,
-        contour= "off",
-        contour_label= "off",
-        contour_shade_method= "area_fill",
-        contour_level_selection_type= "level_list",
-        contour_level_list=  [940.+i*2.5 for i in range(51)],
-        contour_shade_colour_method= "list",
-        contour_shade_colour_list= [
-            '#FD90EB', '#EB78E5', '#EF53E0', '#F11FD3', '#F11FD3', '#A20E9B', '#880576', '#6D0258', '#5F0853', 
-            '#2A0DA8', '#2F1AA7', '#3D27B4', '#3F3CB6', '#6D5CDE', '#A28CF9', '#C1B3FF', '#DDDCFE', '#1861DB',
-            '#206CE5', '#2484F4', '#52A5EE', '#91D4FF', '#B2EFF8', '#DEFEFF', '#C9FDBD', '#91F78B', '#53ED54',
-            '#1DB31E', '#0CA104', '#FFF9A4', '#FFE27F', '#FAC235', '#FF9D04', '#FF5E00', '#F83302', '#E01304',
-            '#A20200', '#603329', '#8C6653', '#B18981', '#DDC0B3', '#F8A3A2', '#DD6663', '#CA3C3B', '#A1241D', 
-            '#6C6F6D', '#8A8A8A', '#AAAAAA', '#C5C5C5', '#D5D5D5', '#E7E3E4'])
+    contour_kwargs = {'contour_method': 'linear'} if contour_fast else {}
+    mslp_contour = _mcont_cached(
+        'mslp', contour_hilo_window_size=-(-5//skip_mslp), **contour_kwargs)
     plots.extend([mslp_field, mslp_contour])
 
     # Define the simple contouring for gh
-    if gh is not None:
-        gh_contour = common._get_gh_contour()
+    if gh_field is not None:
+        gh_contour = _gh_contour_cached()
         plots.extend([gh_field, gh_contour])
 
     # Add a legend
-    legend = common._get_legend(china_map, title="Pressure [mb]", frequency=2)
+    legend = _legend_cached(china_map, title="Pressure [mb]", frequency=2)
     plots.append(legend)
 
     # Add the title
@@ -588,9 +797,74 @@ def draw_mslp(mslp, lon, lat, gh=None, map_region=None,
     plots.append(title)
 
     # Add china province
-    china_coastlines = map_set.get_mcoast(name='PROVINCE')
+    china_coastlines = _mcoast_cached('PROVINCE')
     plots.append(china_coastlines)
 
     # final plot
-    return util.magics_plot(plots, outfile)
+    return util.magics_plot(plots, outfile, fast=fast)
+
+
+def _draw_one(func, kwargs):
+    """
+    Call the draw function with keyword arguments, the process pool worker.
+    """
+    return func(**kwargs)
+
 
+def _draw_many(func, inputs, nproc=None, mp_context=None, fast=False):
+    """
+    Call the draw function for each keyword arguments dictionary in a process pool.
+    """
+    inputs = [{'fast': fast, **kwargs} for kwargs in inputs]
+
+    # workers writing the same png would overwrite each other
+    outfiles = [kwargs['outfile'] for kwargs in inputs if kwargs.get('outfile') is not None]
+    if len(set(outfiles)) != len(outfiles):
+        raise ValueError("outfile should be distinct for each input.")
+
+    with ProcessPoolExecutor(max_workers=nproc, mp_context=mp_context) as executor:
+        return list(executor.map(_draw_one, itertools.repeat(func), inputs))
+
+
+def draw_wind_upper_many(inputs, nproc=None, mp_context=None, fast=False):
+    """
+    Draw independent draw_wind_upper maps, like forecast times, in parallel processes.
+    Each worker process runs its own Magics, so each input should have a
+    distinct outfile (or None for a temporary file).
+
+    Note the fork start method (Linux default) copies the parent process,
+    including the Magics library state and util._MAGICS_LOCK. If the parent
+    has other threads drawing with Magics, use
+    mp_context=multiprocessing.get_context('spawn').
+
+    Args:
+        inputs (iterable): keyword arguments dictionary of draw_wind_upper for each map.
+        nproc (int, optional): number of processes. Defaults to None, os.cpu_count().
+        mp_context (optional): multiprocessing context. Defaults to None.
+        fast (bool, optional): draft output for inputs without their own 'fast' item.
+
+    Return:
+        list of images.
+    """
+    return _draw_many(draw_wind_upper, inputs, nproc=nproc, mp_context=mp_context, fast=fast)
+
+
+def draw_wind_high_many(inputs, nproc=None, mp_context=None, fast=False):
+    """
+    Draw draw_wind_high maps in parallel, see draw_wind_upper_many.
+    """
+    return _draw_many(draw_wind_high, inputs, nproc=nproc, mp_context=mp_context, fast=fast)
+
+
+def draw_vort_high_many(inputs, nproc=None, mp_context=None, fast=False):
+    """
+    Draw draw_vort_high maps in parallel, see draw_wind_upper_many.
+    """
+    return _draw_many(draw_vort_high, inputs, nproc=nproc, mp_context=mp_context, fast=fast)
+
+
+def draw_mslp_many(inputs, nproc=None, mp_context=None, fast=False):
+    """
+    Draw draw_mslp maps in parallel, see draw_wind_upper_many.
+    """
+    return _draw_many(draw_mslp, inputs, nproc=nproc, mp_context=mp_context, fast=fast)
@@ -9,7 +9,6 @@
 
 import os
 import sys
-import math
 import numpy as np
 from PIL import Image
 import threading
@@ -27,13 +26,20 @@ from nmc_met_graphics.magics import map_set
 _MAGICS_LOCK = threading.Lock()
 
 
-def magics_plot(plots, outfile=None):
+def magics_plot(plots, outfile=None, fast=False):
     """
     调用magics生成图像文件, 并读取文件内容返回图像数组.
     refer to https://github.com/ecmwf/magics-python/blob/master/Magics/macro.py  848-878行
+
+    Args:
+        plots (list): magics plot elements.
+        outfile (str, optional): output png file name. Defaults to None.
+        fast (bool, optional): draft output, turn off cairo antialiasing
+            to speed up rendering. Defaults to False.
     """
     
     with _MAGICS_LOCK:
+        remove_flag = False
         if outfile is None:
             f, outfile = tempfile.mkstemp(".png")
             os.close(f)
@@ -42,11 +48,15 @@ def magics_plot(plots, outfile=None):
         base, _ = os.path.splitext(outfile)
 
         # add outfile file
+        output_kwargs = {}
+        if fast:
+            output_kwargs['output_cairo_antialias'] = 'off'
         img = magics.output(
           output_formats= ['png'],
           output_name_first_page_number= 'off',
           output_width= 1000,
-          output_name= base)
+          output_name= base,
+          **output_kwargs)
         all = [img]
         all.extend(plots)
 
@@ -74,11 +84,18 @@ def get_skip_vector(lon, lat, map_region):
     else:
         lon1 = lon
         lat1 = lat
-    skip_vector = max(math.ceil(len(lon1)/60.0), math.ceil(len(lat1)/30.0))
+    skip_vector = _default_skip(len(lon1), len(lat1))
     
     return skip_vector
 
 
+def _default_skip(nlon, nlat):
+    """
+    Default skip number, about 60 vectors along longitude and 30 along latitude.
+    """
+    return max(-(-nlon//60), -(-nlat//30), 1)
+
+
 def minput_2d(data, lon, lat, metadata):
     """
     Put the data into magics minput function.
@@ -106,6 +123,55 @@ def minput_2d(data, lon, lat, metadata):
         input_metadata = metadata)
 
 
+def is_regular_grid(lon, lat):
+    """
+    Check lon and lat are evenly spaced 1D vectors (at least 2 points).
+
+    Args:
+        lon (np.array): 1D vector, [nlon]
+        lat (np.array): 1D vector, [nlat]
+    """
+
+    for coord in (lon, lat):
+        coord = np.squeeze(np.asarray(coord, dtype=np.float64))
+        if coord.ndim != 1 or coord.size < 2:
+            return False
+        if not np.allclose(np.diff(coord), coord[1]-coord[0]):
+            return False
+    return True
+
+
+def minput_2d_raw(data, lon, lat, metadata=None):
+    """
+    Put the regular grid data into magics minput function.
+    The grid is described by the first point and grid steps instead of
+    the latitude/longitude lists. Contiguous float64 data is passed on
+    without a copy, other data is converted once.
+
+    Args:
+        data (np.array): 2D array, [nlat, nlon]
+        lon (np.array): evenly spaced 1D vector, [nlon]
+        lat (np.array): evenly spaced 1D vector, [nlat]
+        metadata (dictionary): variable name and units information, 
+            like {'units': 'K', 'long_name': '2 metre temperature'}. Defaults to None.
+    """
+
+    input_field_values = np.ascontiguousarray(np.squeeze(data), dtype=np.float64)
+    lat = np.squeeze(lat)
+    lon = np.squeeze(lon)
+    
+    # put values into magics
+    kwargs = {} if metadata is None else {'input_metadata': metadata}
+    return magics.minput(
+        input_type = "geographical",
+        input_field = input_field_values,
+        input_field_initial_latitude = float(lat[0]),
+        input_field_latitude_step = float(lat[1]-lat[0]),
+        input_field_initial_longitude = float(lon[0]),
+        input_field_longitude_step = float(lon[1]-lon[0]),
+        **kwargs)
+
+
 def minput_2d_vector(udata, vdata, lon, lat, skip=1, metadata=None):
     """
     Put the data into magics minput function.
@@ -125,8 +191,8 @@ def minput_2d_vector(udata, vdata, lon, lat, skip=1, metadata=None):
     # extract values
     lat = np.squeeze(lat.astype(np.float64))    # 1D vector
     lon = np.squeeze(lon.astype(np.float64))    # 1D vector
-    uwind_field = np.squeeze(udata.astype(np.float64))    # 2D array, [nlat, nlon]
-    vwind_field = np.squeeze(vdata.astype(np.float64))    # 2D array, [nlat, nlon]
+    uwind_field = np.squeeze(udata.astype(np.float64, copy=False))    # 2D array, [nlat, nlon]
+    vwind_field = np.squeeze(vdata.astype(np.float64, copy=False))    # 2D array, [nlat, nlon]
     lon, lat = np.meshgrid(lon, lat)
 
     # skip values and flatten